@@ -2,9 +2,9 @@ import os
 import sqlite3
 from flask import Flask, render_template, request, redirect, url_for, jsonify
 from dotenv import load_dotenv
-from db_manager import get_db_connection
+from db_manager import (get_db_connection, get_sources, has_search_index, is_query_syntax_error,
+                        read_summary_text, search_summaries)
 from datetime import date, timedelta
-import json
 
 load_dotenv()
 app = Flask(__name__)
@@ -42,23 +42,18 @@ def index():
             processing_job = True
 
         # Fetch summaries for the last 7 days
-        for i in range(7):
-            current_date = date.today() - timedelta(days=i)
-            summary_data = conn.execute(
-                'SELECT summary_date, summary_text, sources FROM summaries WHERE ticker_symbol = ? AND summary_date = ?',
-                (selected_ticker, current_date.isoformat())
-            ).fetchone()
-            if summary_data:
-                try:
-                    sources_list = json.loads(summary_data['sources']) if summary_data['sources'] else []
-                except (json.JSONDecodeError, TypeError):
-                    sources_list = []
-                
-                summaries.append({
-                    'date': summary_data['summary_date'],
-                    'text': summary_data['summary_text'],
-                    'sources': sources_list
-                })
+        rows = conn.execute(
+            'SELECT id, summary_date, summary_text, summary_zlib FROM summaries '
+            'WHERE ticker_symbol = ? AND summary_date > ? ORDER BY summary_date DESC',
+            (selected_ticker, (date.today() - timedelta(days=7)).isoformat())
+        ).fetchall()
+        sources = get_sources(conn, [row['id'] for row in rows])
+        for row in rows:
+            summaries.append({
+                'date': row['summary_date'],
+                'text': read_summary_text(row),
+                'sources': sources[row['id']]
+            })
 
     conn.close()
     
@@ -114,6 +109,43 @@ def job_status(ticker):
     else:
         return jsonify({'status': 'processing'})
 
+@app.route('/search')
+def search():
+    """
+    API endpoint for paginated full-text search across all summaries.
+    Pass raw=1 to use FTS5 query syntax (AND, OR, NEAR, prefix*) directly.
+    """
+    query = request.args.get('q', '').strip()
+    raw = request.args.get('raw', '') in ('1', 'true')
+    ticker = request.args.get('ticker', '').upper().strip() or None
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+
+    if not query:
+        return jsonify({'error': 'Missing search query.'}), 400
+
+    conn = get_db_connection()
+    try:
+        if not has_search_index(conn):
+            return jsonify({'error': 'Search is not available.'}), 503
+        total, results = search_summaries(conn, query, ticker, per_page, (page - 1) * per_page, raw)
+    except sqlite3.OperationalError as e:
+        if is_query_syntax_error(e):
+            return jsonify({'error': 'Invalid search query.'}), 400
+        print(f"!!! Search failed: {e}")
+        return jsonify({'error': 'Search is temporarily unavailable.'}), 503
+    finally:
+        conn.close()
+
+    return jsonify({
+        'query': query,
+        'ticker': ticker,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'results': results
+    })
+
 if __name__ == '__main__':
     app.run(debug=True)
 
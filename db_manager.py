@@ -1,4 +1,6 @@
 import sqlite3
+import json
+import zlib
 
 def get_db_connection():
     """Establishes a connection to the SQLite database."""
@@ -9,7 +11,13 @@ def get_db_connection():
 def init_db():
     """Initializes the database with the required tables."""
     conn = get_db_connection()
-    
+
+    # Let maintenance.py reclaim free pages with incremental_vacuum instead of a
+    # full VACUUM. Existing databases need one VACUUM for the mode to take effect.
+    if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+
     # Create tickers table
     conn.execute('''
         CREATE TABLE IF NOT EXISTS tickers (
@@ -17,8 +25,9 @@ def init_db():
             symbol TEXT UNIQUE NOT NULL
         )
     ''')
-    
+
     # Create summaries table
+    # summary_text is emptied once a summary is compressed into summary_zlib.
     conn.execute('''
         CREATE TABLE IF NOT EXISTS summaries (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -26,10 +35,25 @@ def init_db():
             summary_date DATE NOT NULL,
             summary_text TEXT NOT NULL,
             sources TEXT,
+            summary_zlib BLOB,
             UNIQUE(ticker_symbol, summary_date)
         )
     ''')
-    
+    columns = [row['name'] for row in conn.execute('PRAGMA table_info(summaries)')]
+    if 'summary_zlib' not in columns:
+        conn.execute('ALTER TABLE summaries ADD COLUMN summary_zlib BLOB')
+
+    # Create the normalised sources table (replaces the JSON blob in summaries.sources)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS summary_sources (
+            summary_id INTEGER NOT NULL REFERENCES summaries(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            url TEXT NOT NULL,
+            PRIMARY KEY (summary_id, position)
+        )
+    ''')
+
     # Create the new jobs table
     conn.execute('''
         CREATE TABLE IF NOT EXISTS jobs (
@@ -39,11 +63,160 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
-    
+    # Indexes for the worker queue lookup and the per-ticker status checks
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_ticker_created ON jobs (ticker_symbol, created_at)')
+
+    # Finished jobs are moved here by maintenance.py
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs_archive (
+            id INTEGER PRIMARY KEY,
+            ticker_symbol TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TIMESTAMP,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Full-text index over summaries. It is contentless (the text lives in
+    # summaries) so compressing old summaries does not leave a second copy behind.
+    fts_created = False
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'summaries_fts'"
+        ).fetchone()
+        if not exists:
+            conn.execute("CREATE VIRTUAL TABLE summaries_fts USING fts5(summary_text, content='')")
+            fts_created = True
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search disabled, FTS5 is not available: {e}")
+
+    migrate_sources(conn)
+    if fts_created:
+        rebuild_search_index(conn)
+
     conn.commit()
     conn.close()
-    print("Database initialized with tickers, summaries, and jobs tables.")
+    print("Database initialized with tickers, summaries, summary_sources, jobs and jobs_archive tables.")
+
+def has_search_index(conn):
+    """Returns True if the FTS5 summaries index exists."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'summaries_fts'"
+    ).fetchone() is not None
+
+def read_summary_text(row):
+    """Returns the text of a summaries row, decompressing it if needed."""
+    if row['summary_zlib'] is not None:
+        return zlib.decompress(row['summary_zlib']).decode('utf-8')
+    return row['summary_text']
+
+def get_sources(conn, summary_ids):
+    """Returns a dict of summary id -> list of {'title', 'url'} sources."""
+    sources = {summary_id: [] for summary_id in summary_ids}
+    if not summary_ids:
+        return sources
+    placeholders = ','.join('?' * len(summary_ids))
+    rows = conn.execute(
+        f'SELECT summary_id, title, url FROM summary_sources WHERE summary_id IN ({placeholders}) '
+        'ORDER BY summary_id, position',
+        list(summary_ids)
+    ).fetchall()
+    for row in rows:
+        sources[row['summary_id']].append({'title': row['title'], 'url': row['url']})
+    return sources
+
+def save_summary(conn, ticker, summary_date, summary_text, sources):
+    """
+    Inserts a summary with its sources and adds it to the search index.
+    The caller is responsible for committing.
+    """
+    cursor = conn.execute(
+        'INSERT INTO summaries (ticker_symbol, summary_date, summary_text) VALUES (?, ?, ?)',
+        (ticker, summary_date, summary_text)
+    )
+    summary_id = cursor.lastrowid
+    conn.executemany(
+        'INSERT INTO summary_sources (summary_id, position, title, url) VALUES (?, ?, ?, ?)',
+        [(summary_id, i, s['title'], s['url']) for i, s in enumerate(sources)]
+    )
+    if has_search_index(conn):
+        conn.execute(
+            'INSERT INTO summaries_fts (rowid, summary_text) VALUES (?, ?)',
+            (summary_id, summary_text)
+        )
+    return summary_id
+
+def migrate_sources(conn):
+    """Moves any JSON sources left in summaries.sources into summary_sources."""
+    rows = conn.execute('SELECT id, sources FROM summaries WHERE sources IS NOT NULL').fetchall()
+    for row in rows:
+        try:
+            sources_list = json.loads(row['sources']) if row['sources'] else []
+        except (json.JSONDecodeError, TypeError):
+            sources_list = []
+        conn.execute('DELETE FROM summary_sources WHERE summary_id = ?', (row['id'],))
+        conn.executemany(
+            'INSERT INTO summary_sources (summary_id, position, title, url) VALUES (?, ?, ?, ?)',
+            [(row['id'], i, s.get('title') or '', s.get('url') or '')
+             for i, s in enumerate(sources_list) if isinstance(s, dict)]
+        )
+        conn.execute('UPDATE summaries SET sources = NULL WHERE id = ?', (row['id'],))
+    if rows:
+        print(f"Migrated sources for {len(rows)} summaries.")
+
+def rebuild_search_index(conn):
+    """Re-indexes every summary in the FTS5 table."""
+    if not has_search_index(conn):
+        return
+    conn.execute("INSERT INTO summaries_fts (summaries_fts) VALUES ('delete-all')")
+    rows = conn.execute('SELECT id, summary_text, summary_zlib FROM summaries').fetchall()
+    conn.executemany(
+        'INSERT INTO summaries_fts (rowid, summary_text) VALUES (?, ?)',
+        [(row['id'], read_summary_text(row)) for row in rows]
+    )
+    print(f"Search index rebuilt with {len(rows)} summaries.")
+
+def build_match_query(query):
+    """Turns free text into an FTS5 query where every term is a quoted phrase."""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+def is_query_syntax_error(error):
+    """Returns True if an OperationalError was caused by an invalid FTS5 query."""
+    message = str(error)
+    return message.startswith(('fts5:', 'no such column', 'unterminated string'))
+
+def search_summaries(conn, query, ticker=None, limit=20, offset=0, raw=False):
+    """
+    Runs a full-text search over summaries, best matches first.
+    Terms are matched literally unless raw is True, in which case the
+    query is passed to FTS5 as-is.
+    Returns (total, results) where results is a list of summary dicts.
+    """
+    if not raw:
+        query = build_match_query(query)
+    ticker_clause = 'AND s.ticker_symbol = ?' if ticker else ''
+    params = [query] + ([ticker] if ticker else [])
+    total = conn.execute(
+        'SELECT COUNT(*) FROM summaries_fts f JOIN summaries s ON s.id = f.rowid '
+        f'WHERE summaries_fts MATCH ? {ticker_clause}',
+        params
+    ).fetchone()[0]
+    rows = conn.execute(
+        'SELECT s.id, s.ticker_symbol, s.summary_date, s.summary_text, s.summary_zlib '
+        'FROM summaries_fts f JOIN summaries s ON s.id = f.rowid '
+        f'WHERE summaries_fts MATCH ? {ticker_clause} '
+        'ORDER BY f.rank, s.summary_date DESC LIMIT ? OFFSET ?',
+        params + [limit, offset]
+    ).fetchall()
+    sources = get_sources(conn, [row['id'] for row in rows])
+    results = [{
+        'ticker': row['ticker_symbol'],
+        'date': row['summary_date'],
+        'text': read_summary_text(row),
+        'sources': sources[row['id']]
+    } for row in rows]
+    return total, results
 
 if __name__ == '__main__':
     init_db()
-
@@ -0,0 +1,79 @@
+import os
+import sqlite3
+import zlib
+from dotenv import load_dotenv
+
+from db_manager import get_db_connection, has_search_index
+
+load_dotenv()
+
+# Finished jobs older than this are moved to jobs_archive
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+# Archived jobs older than this are deleted for good (0 keeps them forever)
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "365"))
+# Summaries older than this have their text compressed (0 disables compression)
+COMPRESS_AFTER_DAYS = int(os.getenv("COMPRESS_AFTER_DAYS", "90"))
+
+def archive_old_jobs(conn):
+    """Moves complete and failed jobs past the retention window into jobs_archive."""
+    # Computed once so the copy and the delete see exactly the same set of jobs
+    cutoff = conn.execute(
+        "SELECT datetime('now', ?)", (f'-{JOB_RETENTION_DAYS} days',)
+    ).fetchone()[0]
+    finished = "status IN ('complete', 'failed') AND created_at < ?"
+    conn.execute(
+        'INSERT OR REPLACE INTO jobs_archive (id, ticker_symbol, status, created_at) '
+        f'SELECT id, ticker_symbol, status, created_at FROM jobs WHERE {finished}',
+        (cutoff,)
+    )
+    archived = conn.execute(f'DELETE FROM jobs WHERE {finished}', (cutoff,)).rowcount
+    print(f"Archived {archived} old jobs.")
+
+    if ARCHIVE_RETENTION_DAYS > 0:
+        purged = conn.execute(
+            "DELETE FROM jobs_archive WHERE archived_at < datetime('now', ?)",
+            (f'-{ARCHIVE_RETENTION_DAYS} days',)
+        ).rowcount
+        print(f"Purged {purged} jobs from the archive.")
+
+def compress_old_summaries(conn):
+    """Compresses the text of summaries older than COMPRESS_AFTER_DAYS."""
+    if COMPRESS_AFTER_DAYS <= 0:
+        return
+    rows = conn.execute(
+        "SELECT id, summary_text FROM summaries WHERE summary_zlib IS NULL "
+        "AND summary_date < date('now', ?)",
+        (f'-{COMPRESS_AFTER_DAYS} days',)
+    ).fetchall()
+    conn.executemany(
+        "UPDATE summaries SET summary_zlib = ?, summary_text = '' WHERE id = ?",
+        [(zlib.compress(row['summary_text'].encode('utf-8'), 9), row['id']) for row in rows]
+    )
+    print(f"Compressed {len(rows)} old summaries.")
+
+def run_maintenance():
+    """Archives old jobs, compresses old summaries and reclaims the freed space."""
+    print("Starting database maintenance...")
+    conn = get_db_connection()
+    try:
+        archive_old_jobs(conn)
+        compress_old_summaries(conn)
+        if has_search_index(conn):
+            conn.execute("INSERT INTO summaries_fts (summaries_fts) VALUES ('optimize')")
+        conn.commit()
+        conn.execute('PRAGMA optimize')
+        try:
+            # Frees pages left by the deletes without rewriting the whole file.
+            # executescript runs the pragma to completion; execute frees one page.
+            conn.executescript('PRAGMA incremental_vacuum;')
+        except sqlite3.OperationalError as e:
+            print(f"Skipped reclaiming free pages, the database is busy: {e}")
+        print("Database maintenance finished.")
+    except Exception as e:
+        conn.rollback()
+        print(f"!!! An error occurred during maintenance: {e}")
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    run_maintenance()
@@ -1,11 +1,10 @@
 import os
 import sqlite3
-import json
 from datetime import date, timedelta
 from dotenv import load_dotenv
 from scraper import consolidate_news, get_full_article_text
 from ai_processor import select_top_articles, generate_summary
-from db_manager import get_db_connection
+from db_manager import get_db_connection, read_summary_text, save_summary
 
 load_dotenv()
 
@@ -48,10 +47,10 @@ def run_daily_job():
         
         # 2. Get yesterday's summary for historical context
         historical_summary_row = conn.execute(
-            'SELECT summary_text FROM summaries WHERE ticker_symbol = ? AND summary_date = ?',
+            'SELECT summary_text, summary_zlib FROM summaries WHERE ticker_symbol = ? AND summary_date = ?',
             (ticker, yesterday_str)
         ).fetchone()
-        historical_summary = historical_summary_row['summary_text'] if historical_summary_row else None
+        historical_summary = read_summary_text(historical_summary_row) if historical_summary_row else None
         
         try:
             # 3. Scrape news
@@ -85,12 +84,8 @@ def run_daily_job():
             final_summary = generate_summary(GEMINI_API_KEY, articles_with_text, ticker, historical_summary)
             
             # 7. Save to database
-            sources_json = json.dumps([{'title': a['title'], 'url': a['url']} for a in articles_with_text])
-            
-            conn.execute(
-                'INSERT INTO summaries (ticker_symbol, summary_date, summary_text, sources) VALUES (?, ?, ?, ?)',
-                (ticker, today_str, final_summary, sources_json)
-            )
+            sources = [{'title': a['title'], 'url': a['url']} for a in articles_with_text]
+            save_summary(conn, ticker, today_str, final_summary, sources)
             conn.commit()
             print(f"Successfully generated and saved summary for {ticker}.")
 
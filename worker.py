@@ -1,11 +1,10 @@
 import os
 import sqlite3
 import time
-import json
 from datetime import date, timedelta
 from dotenv import load_dotenv
 
-from db_manager import get_db_connection
+from db_manager import get_db_connection, read_summary_text, save_summary
 from scraper import consolidate_news, get_full_article_text
 from ai_processor import select_top_articles, generate_summary_with_ai
 
@@ -45,10 +44,10 @@ def process_single_job():
         # Get historical context
         yesterday_str = (date.today() - timedelta(days=1)).isoformat()
         historical_summary_row = conn.execute(
-            'SELECT summary_text FROM summaries WHERE ticker_symbol = ? AND summary_date = ?',
+            'SELECT summary_text, summary_zlib FROM summaries WHERE ticker_symbol = ? AND summary_date = ?',
             (ticker, yesterday_str)
         ).fetchone()
-        historical_summary = historical_summary_row['summary_text'] if historical_summary_row else None
+        historical_summary = read_summary_text(historical_summary_row) if historical_summary_row else None
 
         # Scrape news
         print(f"Collecting news for {ticker}...")
@@ -77,11 +76,8 @@ def process_single_job():
         final_summary = generate_summary_with_ai(articles_with_text, ticker, historical_summary)
         
         # Save results
-        sources_json = json.dumps([{'title': a['title'], 'url': a['url']} for a in articles_with_text])
-        conn.execute(
-            'INSERT INTO summaries (ticker_symbol, summary_date, summary_text, sources) VALUES (?, ?, ?, ?)',
-            (ticker, today_str, final_summary, sources_json)
-        )
+        sources = [{'title': a['title'], 'url': a['url']} for a in articles_with_text]
+        save_summary(conn, ticker, today_str, final_summary, sources)
         
         # --- Mark job as 'complete' ---
         conn.execute("UPDATE jobs SET status = 'complete' WHERE id = ?", (job_id,))